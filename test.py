@@ -79,6 +79,8 @@ ordered_dict = OrderedDict(small_dict)
 show("ordered_dict")
 large_dict = {'a':42*99999, 'c':3, 'b':'foo'*100, 'sub': {'l': 42, 'far': 'zoo', 'cow': 'moo'}}
 show("large_dict")
+long_keys_dict = {'b':'foo'*100, 'sub': {f'a_rather_long_key_number_{i}': {'l': i} for i in range(5)}}
+show("long_keys_dict")
 
 show("wtf[42]")
 
@@ -91,6 +93,14 @@ def generator_example(starting_list, endless=False):
 show("normal_function")
 show("generator_example")
 
+class Frobnicator:
+    __name__ = 'frobnicate'
+    def __call__(self, frobbles):
+        pass
+
+show("Frobnicator()")
+show("{'b':'foo'*100, 'frobnicator': Frobnicator()}")
+
 @wtf.happens
 def black_box(a, b, x=42, y=-1):
     return frobbles
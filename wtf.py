@@ -1,19 +1,19 @@
 #!/usr/bin/env python3
 
 from collections import namedtuple, OrderedDict
-from datetime import datetime, timedelta
 from dataclasses import dataclass
-import xml.etree.ElementTree
 from pathlib import Path
 import subprocess
-import traceback
 import tempfile
+import linecache
+import functools
 import logging
 import inspect
 import pprint
 import shutil
+import weakref
 import json
-import pdb
+import time
 import bdb
 import sys
 import re
@@ -21,35 +21,112 @@ import io
 
 
 red = lambda s: f'\033[38;5;9m{s}\033[0m'
-BORING_MODULES = ['wtf', 'threading', 'bdb', 'weakref', 'logging']
+BORING_MODULES = ['wtf', 'threading', 'bdb', 'weakref', 'logging', 'functools']
+SourceLine = namedtuple('SourceLine', ['location', 'code', 'frame'])
 
+_RE_CAMEL = re.compile(r'([a-z])([A-Z])')
+_RE_NONWORD = re.compile(r'[^a-zA-Z]+')
+_RE_MEMADDR = re.compile(r'(\s*object)? at 0x[a-fA-F0-9]+')
+_RE_WTF_CALL = re.compile(r'wtf[\(\[](\w+)')
+_RE_JSON_CHAR = re.compile(r'char (\d+)')
+_RE_COLLECTION_NAME = re.compile(r'^(get|list)?_*(\w)s$')
 
+
+@functools.lru_cache(maxsize=4096)
 def _pythonise_var_name(heathenscript):
-    underscore_separated = re.sub(r'([a-z])([A-Z])', r'\1_\2', heathenscript)
-    only_word_chars = re.sub(r'[^a-zA-Z]+', '_', underscore_separated)
+    underscore_separated = _RE_CAMEL.sub(r'\1_\2', heathenscript)
+    only_word_chars = _RE_NONWORD.sub('_', underscore_separated)
     return only_word_chars.lower().strip('_')
 
 
+_BORING_TYPES = (float, int, bool, str, list, tuple, set, dict)
+_BORING_ATTR_SETS = {boring_type: frozenset(dir(boring_type())) for boring_type in _BORING_TYPES}
+# Objects of exactly these types have no fields, keys or items that _find could recurse into.
+_LEAF_TYPES = frozenset((float, int, bool, str, type(None)))
+
+
 def _is_boring(x, attribute_name=None):
-    boring_types = (float, int, bool, str, list, tuple, set, dict)
     if attribute_name:
         if attribute_name.startswith('_'):
             return True
-        for boring_type in boring_types:
-            if issubclass(type(x), boring_type) and hasattr(boring_type(), attribute_name):
+        x_type = type(x)
+        for boring_type in _BORING_TYPES:
+            if issubclass(x_type, boring_type) and attribute_name in _BORING_ATTR_SETS[boring_type]:
                 return True
     else:
-        for boring_type in boring_types:
+        for boring_type in _BORING_TYPES:
             if x == boring_type or type(x) == boring_type:
                 return True
     return False
 
 
+_SIG_CACHE = dict()
+_DOC_CACHE = dict()
+
+
+def _cached(cache, x, compute):
+    '''compute(x), remembered for as long as x is alive. None if compute(x) raised.'''
+    # Only classes, functions and module-level builtins tend to stick around and get
+    # described again. Bound methods are created afresh on every attribute access, so
+    # for them (and anything else) registering the finalizer costs more than it saves.
+    remember = (isinstance(x, type) or inspect.isfunction(x)
+                or (inspect.isbuiltin(x) and inspect.ismodule(getattr(x, '__self__', None))))
+    key = id(x)
+    if remember and key in cache:
+        return cache[key]
+    try:
+        result = compute(x)
+    except Exception:
+        result = None
+    if not remember:
+        return result
+    try:
+        weakref.finalize(x, cache.pop, key, None)
+    except TypeError:
+        # We can't tell when x is gone and its id gets reused, so don't remember it.
+        return result
+    cache[key] = result
+    return result
+
+
+def _signature(x):
+    return _cached(_SIG_CACHE, x, inspect.signature)
+
+
+def _docstring(x):
+    return _cached(_DOC_CACHE, x, inspect.getdoc)
+
+
+def _short_name_of_type(t):
+    '''Like wtf[t].short for a class, without describing the whole class first.'''
+    if (signature := _signature(t)) is not None:
+        description = f'{t.__name__}{signature}'
+        if len(description) <= 100 and '\n' not in description:
+            return description
+    return f'{t.__name__}()'
+
+
 class UnIronic(str):
     def __repr__(self):
         return self
 
 
+class _NotOneShortLine(Exception):
+    pass
+
+
+class _ShortLines(list):
+    '''Collects the lines describing an object for WTF.short, giving up as soon as they won't make one short line.'''
+    overflowed = False
+
+    def append(self, line):
+        if self or len(line) > 100 or '\n' in line:
+            # Remember, in case a describer swallows the exception.
+            self.overflowed = True
+            raise _NotOneShortLine()
+        super().append(line)
+
+
 class WTF:
     '''WTF is this?
 
@@ -61,40 +138,71 @@ class WTF:
     @wtf.happens       # A decorator for a function that you want to study
     '''
     def __call__(self, x, stop=True):
+        W = WTF._of(x, name=self._source_var_name())
+        if stop:
+            print(W)
+            if not hasattr(sys, 'ps1'):
+                import pdb
+                pdb.Pdb(skip=BORING_MODULES).set_trace()
+        return W
+    def __getitem__(cls, x):
+        return wtf(x, stop=False)
+
+
+    @staticmethod
+    def _of(x, name=None):
+        '''Describe x without looking for its name in the calling code, for our own calls.'''
         W = WTF()
         W.x = x
-        W._name = W._source_var_name()
+        W._name = name
         if type(W.x) == type:
             W._type = W.x
         else:
             W._type = type(W.x)
         W._type_name = W._type.__name__
-        W._human_readable_string_representation = W._remove_memory_address(W.x)
-        W._machine_readable_string_representation = W._remove_memory_address(repr(W.x))
-        
-        if stop:
-            print(W)
-            if not hasattr(sys, 'ps1'):
-                pdb.Pdb(skip=BORING_MODULES).set_trace()
         return W
-    def __getitem__(cls, x):
-        return wtf(x, stop=False)
+
+
+    @functools.cached_property
+    def _fields_and_functions(self):
+        fields = list()
+        functions = list()
+        for p in dir(self.x):
+            if _is_boring(self.x, p):
+                continue
+            if callable(getattr(self.x, p, None)):
+                functions.append(p)
+            else:
+                fields.append(p)
+        return tuple(fields), tuple(functions)
 
 
     @property
     def fields(self):
-        return list(filter(lambda p: not _is_boring(self.x, p) and not callable(getattr(self.x, p, None)), dir(self.x)))
+        return list(self._fields_and_functions[0])
 
 
     @property
     def functions(self):
-        return list(filter(lambda p: not _is_boring(self.x, p) and callable(getattr(self.x, p, None)), dir(self.x)))
+        return list(self._fields_and_functions[1])
 
 
     def __repr__(self):
         return str(self)
 
 
+    # Only worked out when needed: str() and repr() of something big and nested can be expensive,
+    # and WTFs created while recursing through it often never get printed.
+    @functools.cached_property
+    def _human_readable_string_representation(self):
+        return self._remove_memory_address(self.x)
+
+
+    @functools.cached_property
+    def _machine_readable_string_representation(self):
+        return self._remove_memory_address(repr(self.x))
+
+
     @property
     def _fully_qualified_type_name(self):
         x_type = type(self.x)
@@ -105,253 +213,331 @@ class WTF:
 
 
     def __str__(self):
-        type_name = self._type_name
         lines = list()
-
-        match self.x:
-            case float() | int():
-                lines.append(f'{type_name}({self._machine_readable_string_representation})')
-            case str() | bool():
-                lines.append(self._machine_readable_string_representation)
-            case list() | tuple() | set() | Object():
-                lines.append(self.code)
-            case OrderedDict():
-                lines.append(self._fully_qualified_type_name)
-                dictised = dict(self.x)
-                # See if printing the whole thing would be too much clutter.
-                pformatted = pprint.pformat(dictised)
-                if len(pformatted) < 300:
-                    lines.append(pformatted)
-                else:
-                    # Alternatively, only show keys and some analytics about each value.
-                    for k, v in dictised.items():
-                        lines.append(f'{k}:\t{wtf(v, stop=False).short}')
-            case dict():
-                # See if printing the whole thing would be too much clutter.
-                pformatted = pprint.pformat(self.x)
-                if len(pformatted) < 300:
-                    lines.append(pformatted)
-                else:
-                    # Alternatively, only show keys and some analytics about each value.
-                    for k, v in self.x.items():
-                        lines.append(f'{k}:\t{wtf(v, stop=False).short}')
-            case json.decoder.JSONDecodeError() if (match := re.search(r'char (\d+)', str(self.x))):
-                lines.append(self._machine_readable_string_representation)
-                try:
-                    char_number = min(int(match.group(1)), len(self.x.doc)-1)
-                    context_snippet_length = 80
-                    context_before = UnIronic(self.x.doc[char_number-((context_snippet_length//2)-2):char_number])
-                    bad = UnIronic(self.x.doc[char_number])
-                    context_after = UnIronic(self.x.doc[char_number:char_number+((context_snippet_length//2)-2)])
-                    lines.append(context_before + red(bad) + context_after)
-                    if 0 <= ord(self.x.doc[char_number]) <= 31:
-                        lines.append(f'hint: json.loads(s, strict=False)')
-                except:
-                    pass
-            case _:
-                if isinstance(self.x, Exception):
-                    lines.append(self._fully_qualified_type_name)
-                    lines.append(self._human_readable_string_representation)
-                elif isinstance(self.x, xml.etree.ElementTree.Element):
-                    pass
-                elif inspect.isgeneratorfunction(self.x) and self._human_readable_string_representation.startswith('<function '):
-                    lines.append(self._human_readable_string_representation.replace('<function ', '<generator function '))
-                elif self._machine_readable_string_representation == self._human_readable_string_representation:
-                    lines.append(self._machine_readable_string_representation)
-                else:
-                    lines.append(    f'str():     {self.x}')
-                    lines.append(    f'repr():    {self.x!r}')
-                if not (self._fully_qualified_type_name in self._machine_readable_string_representation or self._fully_qualified_type_name.startswith('builtins.')):
-                    lines.append(    f'type:      {self._fully_qualified_type_name}')
-                try:
-                    source_file_path = inspect.getfile(self.x)
-                    if source_file_path not in self._machine_readable_string_representation:
-                        lines.append(f'from:      {source_file_path}')
-                except TypeError:
-                    pass
-                inherits = ', '.join([wtf[o].short for o in self._type.__bases__ if o != object])
-                grandparents = list(self._type.__mro__)
-                for uninteresting in self._type.__bases__ + (self._type, object):
-                    try:
-                        grandparents.remove(uninteresting)
-                    except ValueError:
-                        pass
-                if grandparents:
-                    inherits += ' (and ' + ', '.join([wtf[o].short for o in grandparents]) + ')'
-                if inherits:
-                    lines.append(    'inherits:  ' + inherits)
-                if self.fields:
-                    lines.append('fields:    ' + ', '.join(self.fields))
-                if self.functions:
-                    lines.append('functions: ' + ', '.join([f'{p}()' for p in self.functions]))
-                if callable(self.x):
-                    # For callables, reconstruct the signature.
-                    try:
-                        lines.append(f'{self.x.__name__}{inspect.signature(self.x)}')
-                    except:
-                        pass
-                elif (name := getattr(self.x, '__name__', None)) and name not in self._machine_readable_string_representation:
-                    # Not a callable, but has a name.
-                    lines.append(f'name:      {name}')
-                if docstring := inspect.getdoc(self.x):
-                    # If available, show the docstring.
-                    for line in docstring.split('\n'):
-                        lines.append(f'\t{line}')
-                if isinstance(self.x, xml.etree.ElementTree.ElementTree):
-                    reconstructed_xml = xml.etree.ElementTree.tostring(self.x.getroot(), encoding='unicode')
-                    if len(reconstructed_xml) < 1000:
-                        lines.append(reconstructed_xml)
-                elif isinstance(self.x, xml.etree.ElementTree.Element):
-                    reconstructed_xml = xml.etree.ElementTree.tostring(self.x, encoding='unicode')
-                    if len(reconstructed_xml) < 1000:
-                        lines.append(reconstructed_xml)
-                    else:
-                        lines.append(f'<{self.x.tag}>')
+        self._describe(lines)
         return UnIronic('\n'.join(lines))
 
 
-    @property
+    def _describe(self, lines):
+        # Look up how to describe x by its class (or the nearest base class we know how to describe).
+        # Like isinstance(), go by __class__ rather than type(), so proxies are described as what they stand in for.
+        for t in self.x.__class__.__mro__:
+            if describe := _STR_DISPATCH.get(t):
+                break
+        else:
+            describe = WTF._str_other
+        describe(self, lines)
+
+
+    def _str_number(self, lines):
+        lines.append(f'{self._type_name}({self._machine_readable_string_representation})')
+
+
+    def _str_literal(self, lines):
+        lines.append(self._machine_readable_string_representation)
+
+
+    def _str_collection(self, lines):
+        lines.append(self.code)
+
+
+    def _str_ordered_dict(self, lines):
+        lines.append(self._fully_qualified_type_name)
+        dictised = dict(self.x)
+        # See if printing the whole thing would be too much clutter.
+        pformatted = pprint.pformat(dictised)
+        if len(pformatted) < 300:
+            lines.append(pformatted)
+        else:
+            # Alternatively, only show keys and some analytics about each value.
+            for k, v in dictised.items():
+                lines.append(f'{k}:\t{WTF._of(v).short}')
+
+
+    def _str_dict(self, lines):
+        # See if printing the whole thing would be too much clutter.
+        pformatted = pprint.pformat(self.x)
+        if len(pformatted) < 300:
+            lines.append(pformatted)
+        else:
+            # Alternatively, only show keys and some analytics about each value.
+            for k, v in self.x.items():
+                lines.append(f'{k}:\t{WTF._of(v).short}')
+
+
+    def _str_json_decode_error(self, lines):
+        if not (match := _RE_JSON_CHAR.search(str(self.x))):
+            return self._str_other(lines)
+        lines.append(self._machine_readable_string_representation)
+        try:
+            char_number = min(int(match.group(1)), len(self.x.doc)-1)
+            context_snippet_length = 80
+            context_before = UnIronic(self.x.doc[char_number-((context_snippet_length//2)-2):char_number])
+            bad = UnIronic(self.x.doc[char_number])
+            context_after = UnIronic(self.x.doc[char_number:char_number+((context_snippet_length//2)-2)])
+            lines.append(context_before + red(bad) + context_after)
+            if 0 <= ord(self.x.doc[char_number]) <= 31:
+                lines.append(f'hint: json.loads(s, strict=False)')
+        except:
+            pass
+
+
+    def _str_other(self, lines):
+        x = self.x
+        x_type = self._type
+        machine_readable = self._machine_readable_string_representation
+        human_readable = self._human_readable_string_representation
+        fully_qualified_type_name = self._fully_qualified_type_name
+        # If nobody imported ElementTree, x can't be XML, so don't pay for importing it.
+        etree = sys.modules.get('xml.etree.ElementTree')
+        if isinstance(x, Exception):
+            lines.append(fully_qualified_type_name)
+            lines.append(human_readable)
+        elif etree and isinstance(x, etree.Element):
+            pass
+        elif inspect.isgeneratorfunction(x) and human_readable.startswith('<function '):
+            lines.append(human_readable.replace('<function ', '<generator function '))
+        elif machine_readable == human_readable:
+            lines.append(machine_readable)
+        else:
+            lines.append(    f'str():     {x}')
+            lines.append(    f'repr():    {x!r}')
+        if not (fully_qualified_type_name in machine_readable or fully_qualified_type_name.startswith('builtins.')):
+            lines.append(    f'type:      {fully_qualified_type_name}')
+        try:
+            source_file_path = inspect.getfile(x)
+            if source_file_path not in machine_readable:
+                lines.append(f'from:      {source_file_path}')
+        except TypeError:
+            pass
+        inherits = ', '.join([_short_name_of_type(o) for o in x_type.__bases__ if o is not object])
+        uninteresting = frozenset(x_type.__bases__ + (x_type, object))
+        grandparents = [o for o in x_type.__mro__ if o not in uninteresting]
+        if grandparents:
+            inherits += ' (and ' + ', '.join([_short_name_of_type(o) for o in grandparents]) + ')'
+        if inherits:
+            lines.append(    'inherits:  ' + inherits)
+        fields, functions = self._fields_and_functions
+        if fields:
+            lines.append('fields:    ' + ', '.join(fields))
+        if functions:
+            lines.append('functions: ' + ', '.join([f'{p}()' for p in functions]))
+        if callable(x):
+            # For callables, reconstruct the signature.
+            try:
+                if (signature := _signature(x)) is not None:
+                    lines.append(f'{x.__name__}{signature}')
+            except:
+                pass
+        elif (name := getattr(x, '__name__', None)) and name not in machine_readable:
+            # Not a callable, but has a name.
+            lines.append(f'name:      {name}')
+        if docstring := _docstring(x):
+            # If available, show the docstring.
+            for line in docstring.split('\n'):
+                lines.append(f'\t{line}')
+        if etree and isinstance(x, etree.ElementTree):
+            reconstructed_xml = etree.tostring(x.getroot(), encoding='unicode')
+            if len(reconstructed_xml) < 1000:
+                lines.append(reconstructed_xml)
+        elif etree and isinstance(x, etree.Element):
+            reconstructed_xml = etree.tostring(x, encoding='unicode')
+            if len(reconstructed_xml) < 1000:
+                lines.append(reconstructed_xml)
+            else:
+                lines.append(f'<{x.tag}>')
+
+
+    @functools.cached_property
     def short(self):
-        description = str(self)
+        x = self.x
+        type_name = self._type_name
+        match x:
+            case list() | tuple() | set() | OrderedDict():
+                # str() always describes these over multiple lines, so don't bother generating it.
+                description = None
+            case dict() if len(x) > 1 and len(self._machine_readable_string_representation) >= 300:
+                # Too long to pretty print, so str() would put every key on its own line.
+                description = None
+            case Exception() if not isinstance(x, json.decoder.JSONDecodeError):
+                description = None
+            case _:
+                # Only describe x until it's clear the description won't fit on one short line.
+                lines = _ShortLines()
+                try:
+                    self._describe(lines)
+                except _NotOneShortLine:
+                    pass
+                description = None if lines.overflowed else '\n'.join(lines)
         is_one_short_line = lambda d: d and len(d) <= 100 and '\n' not in d
         if not is_one_short_line(description):
-            match self.x:
+            match x:
                 case Exception():
                     description = f'{self._fully_qualified_type_name}()'
                 case list() | tuple() | set():
                     try:
-                        description = repr(self._type(list([wtf[o].short for o in self.x])))
+                        description = repr(self._type(list([WTF._of(o).short for o in x])))
                         if len(description) > 100:
                             description = self._machine_readable_string_representation
                             if len(description) > 100:
-                                description = f'{len(self.x)} item {self._type_name}'
+                                description = f'{len(x)} item {type_name}'
                     except:
                         # Tried to blindly instantiate something that might be inheriting from an iterable type. It didn't "just work".
                         description = self._machine_readable_string_representation
                         if len(description) > 100:
-                            description = f'{len(self.x)} item {self._type_name}'
+                            description = f'{len(x)} item {type_name}'
                 case OrderedDict():
-                    dictised = dict(self.x)
-                    description = str({wtf[k].short: wtf[v].short for k, v in dictised.items()})
-                    if len(description) > 100:
+                    dictised = dict(x)
+                    description = self._shortened_dict_string(dictised.items(), max_length=100)
+                    if description is None or len(description) > 100:
                         description = self._machine_readable_string_representation
                         if len(description) > 100:
-                            description = f'{self._type_name} with keys: {", ".join(dictised.keys())}'
+                            description = f'{type_name} with keys: {", ".join(dictised.keys())}'
                             if len(description) > 100:
-                                description = f'{len(dictised)} key {self._type_name}'
+                                description = f'{len(dictised)} key {type_name}'
                 case dict():
-                    description = f'{self._type_name}(' + str({wtf[k].short: wtf[v].short for k, v in self.x.items()}) + ')'
-                    if len(description) > 100:
+                    description = self._shortened_dict_string(x.items(), max_length=100-len(f'{type_name}()'))
+                    if description is not None:
+                        description = f'{type_name}({description})'
+                    if description is None or len(description) > 100:
                         description = self._machine_readable_string_representation
                         if len(description) > 100:
-                            description = f'{self._type_name} with keys: {", ".join(self.x.keys())}'
+                            description = f'{type_name} with keys: {", ".join(x.keys())}'
                             if len(description) > 100:
-                                description = f'{len(self.x)} key {self._type_name}'
+                                description = f'{len(x)} key {type_name}'
                 case _:
                     description = None
-                    if callable(self.x):
+                    if callable(x):
                         # For callables, reconstruct the signature.
                         try:
-                            description = f'{self.x.__name__}{inspect.signature(self.x)}'
+                            if (signature := _signature(x)) is not None:
+                                description = f'{x.__name__}{signature}'
                         except:
                             pass
 
         if not is_one_short_line(description):
-            description = f'{self._type_name}()'
+            description = f'{type_name}()'
         return UnIronic(description)
 
 
+    def _shortened_dict_string(self, items, max_length):
+        '''str({short key: short value}), or None as soon as it's clear it won't fit in max_length.'''
+        shortened = dict()
+        # Braces, plus separators and at least one character per value for every key seen so far.
+        # Keys can collide once shortened, so values can't be counted until the end.
+        min_length = len('{}')
+        for k, v in items:
+            short_k = WTF._of(k).short
+            if short_k not in shortened:
+                min_length += len(short_k) + len(': x') + (shortened and len(', ') or 0)
+                if min_length > max_length:
+                    # Don't bother describing the remaining (possibly deeply nested) values.
+                    return None
+            shortened[short_k] = WTF._of(v).short
+        return str(shortened)
+
+
     def _remove_memory_address(self, string):
-        return re.sub(r'(\s*object)? at 0x[a-fA-F0-9]+', r'\1', str(string))
+        string = str(string)
+        if ' at 0x' not in string:
+            return string
+        return _RE_MEMADDR.sub(r'\1', string)
 
 
     def _source_line(self):
-        stack = inspect.stack()
+        this_frame = sys._getframe()
+        frame = this_frame
         try:
-            this_frame = stack[0]
-            this_package_file = Path(this_frame.filename)
-            for frame in stack:
-                code = None
-                if Path(frame.filename) == this_package_file:
-                    # Skip our own calls.
-                    continue
-                try:
-                    code = ''.join(frame.code_context)
-                except TypeError:
-                    if frame.code_context:
-                        code = str(frame.code_context)
-                SourceLine = namedtuple('SourceLine', ['location', 'code', 'frame'])
-                return SourceLine(f'{frame.filename} line {frame.lineno}', code, frame.frame)
+            # Skip our own calls.
+            while frame and frame.f_code.co_filename == this_frame.f_code.co_filename:
+                frame = frame.f_back
+            if frame:
+                filename = frame.f_code.co_filename
+                # The file may have been edited since it was cached (e.g. before a reload in the REPL).
+                linecache.checkcache(filename)
+                # Pass the globals so source can come from the module's loader (e.g. zip imports).
+                code = linecache.getline(filename, frame.f_lineno, frame.f_globals) or None
+                return SourceLine(f'{filename} line {frame.f_lineno}', code, frame)
         finally:
-            del stack
+            del this_frame, frame
 
 
     def _source_var_name(self):
         if (source_line := self._source_line()) and (code := source_line.code):
             #if match := re.search(r'wtf\((\w+)\s*[,\)]', code):
-            if match := re.search(r'wtf[\(\[](\w+)', code):
+            if match := _RE_WTF_CALL.search(code):
                 return match.group(1)
 
 
     @property
     def code(self, case_=''):
+        x = self.x
         source_var_name = self._name or 'x'
         scaffolding = ''
-        if match := re.search(r'^(get|list)?_*(\w)s$', source_var_name):
+        if match := _RE_COLLECTION_NAME.search(source_var_name):
             item_var_name = match.group(2)
         else:
             item_var_name = 'item'
 
-        match self.x:
+        match x:
             case list() | tuple() | set():
                 cases = dict()
-                detail_code_lines_per_case = dict()
-                def add_case(case_code, detail_code_lines=[]):
+                # The last item seen per case, to take example values from.
+                example_per_case = dict()
+                def add_case(case_code, example=None):
                     cases[case_code] = cases.get(case_code, 0) + 1
-                    detail_code_lines_per_case[case_code] = detail_code_lines
+                    example_per_case[case_code] = example
 
                 source_var_name = self._name or 'items'
                 seen_all_items = False
-                start = datetime.now()
-                for item in self.x:
+                case_code_per_shape = dict()
+                deadline = time.monotonic_ns() + 2_000_000_000
+                for item in x:
                     match item:
                         case dict():
-                            case_code = ', '.join([f'{k!r}: {type(v).__name__}({_pythonise_var_name(k)})' for k, v in sorted(item.items())])
-                            case_code = '{' + case_code + '}'
-                            # TODO: Pass a dict(str(k): {wtf(v, stop=False).short})
-                            #       so we can take the longest example value that we find.
-                            add_case(case_code, detail_code_lines=[f"            print(f'{{{_pythonise_var_name(k)}=}}') # {wtf(v, stop=False).short}" for k, v in sorted(item.items())])
+                            # Dicts with the same keys and value types end up in the same case, so only build it once.
+                            shape = frozenset((k, type(v)) for k, v in item.items())
+                            if (case_code := case_code_per_shape.get(shape)) is None:
+                                case_code = ', '.join([f'{k!r}: {type(v).__name__}({_pythonise_var_name(k)})' for k, v in sorted(item.items())])
+                                case_code = '{' + case_code + '}'
+                                case_code_per_shape[shape] = case_code
+                            add_case(case_code, example=item)
                             # TODO: list()
                         case _:
                             add_case(f'{type(item).__name__}({item})')
-                    if datetime.now() - start > timedelta(seconds=2):
+                    if time.monotonic_ns() > deadline:
                         seen_all_items = False
                         break
-                scaffolding = f'''for {item_var_name} in {source_var_name}:
+                parts = [f'''for {item_var_name} in {source_var_name}:
     match {item_var_name}:
-'''
+''']
                 for case_code, num_matches in cases.items():
-                    detail_code = '\n'.join(detail_code_lines_per_case[case_code])
-                    scaffolding += f"""        case {case_code}:
+                    detail_code = ''
+                    if (example := example_per_case[case_code]) is not None:
+                        # TODO: Pass a dict(str(k): {wtf(v, stop=False).short})
+                        #       so we can take the longest example value that we find.
+                        detail_code = '\n'.join([f"            print(f'{{{_pythonise_var_name(k)}=}}') # {WTF._of(v).short}" for k, v in sorted(example.items())])
+                    parts.append(f"""        case {case_code}:
             # Would match{seen_all_items and '' or ' at least'} {num_matches} {item_var_name}s.
 {detail_code}
-"""
+""")
                 if case_ != '':
                     case_ = case_ or f'raise NotImplementedError({item_var_name})'
-                    scaffolding += f"""        case _:
+                    parts.append(f"""        case _:
             {case_}
-"""
+""")
+                scaffolding = ''.join(parts)
             case Object():
-                scaffolding = self.x.code(use_parent_name=True)
-            case _ if callable(self.x):
-                if inspect.isgeneratorfunction(self.x):
-                    scaffolding = f'''for {item_var_name} in {source_var_name}{inspect.signature(self.x)}:
+                scaffolding = x.code(use_parent_name=True)
+            case _ if callable(x) and (signature := _signature(x)) is not None:
+                if inspect.isgeneratorfunction(x):
+                    scaffolding = f'''for {item_var_name} in {source_var_name}{signature}:
     wtf({item_var_name})'''
                 else:
-                    scaffolding = f'{source_var_name}{inspect.signature(self.x)}'
+                    scaffolding = f'{source_var_name}{signature}'
             case Exception():
                 scaffolding = f'''except {self.short.strip("()")} as ex:
-    # {self.x}
+    # {x}
     print(f'{{ex}} while trying...')'''
             case _:
                 scaffolding = f'# {self.short}'
@@ -368,18 +554,25 @@ class WTF:
 
         Tells you what arguments are used when calling it, and tells you what it returns'''
 
+        # The function doesn't change between calls, so only inspect it once.
+        # If function has no signature, let inspect raise about it.
+        signature = _signature(function) or inspect.signature(function)
+        parameters = list(signature.parameters.values())
+        function_short = WTF._of(function).short
+
         def wrapper(*args, **kwargs):
+            import pdb
             args_given_positionally = 0
-            print(f'Press s+[enter] to step into {wtf(function, stop=False).short}{(args or kwargs) and " with:" or ""}')
-            for param, arg in zip(inspect.signature(function).parameters.values(), args):
-                print(f'\t{param.name} = {wtf(arg, stop=False).short}')
+            print(f'Press s+[enter] to step into {function_short}{(args or kwargs) and " with:" or ""}')
+            for param, arg in zip(parameters, args):
+                print(f'\t{param.name} = {WTF._of(arg).short}')
                 args_given_positionally += 1
-            for param in list(inspect.signature(function).parameters.values())[args_given_positionally:]:
-                print(f'\t{param.name} = {wtf(kwargs[param.name], stop=False).short}')
+            for param in parameters[args_given_positionally:]:
+                print(f'\t{param.name} = {WTF._of(kwargs[param.name]).short}')
             pdb.Pdb(skip=BORING_MODULES).set_trace()
             returned = function(*args, **kwargs)
             print()
-            print(f'Returns: {wtf(returned, stop=False)}')
+            print(f'Returns: {WTF._of(returned)}')
             pdb.Pdb(skip=BORING_MODULES).set_trace()
             return returned
         return wrapper
@@ -395,46 +588,53 @@ class WTF:
 
 
     def _find(self, child_name, max_depth=42):
+        x = self.x
+        name = self._name
         if max_depth <= 0:
             return
-        #print(f'Looking in {self._name} ({self.short})')
-        for field_name in self.fields:
+        #print(f'Looking in {name} ({self.short})')
+        for field_name in self._fields_and_functions[0]:
             if child_name != None and field_name != child_name:
                 continue
             #print(f'{field_name} is a field!')
             # Yield matching field.
-            yield Field(self._name, field_name, value=getattr(self.x, field_name))
+            yield Field(name, field_name, value=getattr(x, field_name))
 
-        match self.x:
+        match x:
             case dict():
-                for k, v in self.x.items():
+                for k, v in x.items():
                     if child_name != None and k != child_name:
                         continue
                     #print(f'{k} is a key!')
                     # Yield matching dict key.
-                    yield Key(name=self._name, child_name=k, value=v)
+                    yield Key(name=name, child_name=k, value=v)
                 # Recurse into dict values.
-                for k, v in self.x.items():
-                    dict_value_wtf = wtf(v, stop=False)
+                for k, v in x.items():
+                    if type(v) in _LEAF_TYPES:
+                        continue
+                    dict_value_wtf = WTF._of(v, name=name)
                     for dict_value_result in dict_value_wtf._find(child_name, max_depth=max_depth-1):
-                        yield Key(name=self._name, child_name=k, child=dict_value_result, value=v)
+                        yield Key(name=name, child_name=k, child=dict_value_result, value=v)
             case list():
-                #print(f'Looping over a {len(self.x)} item list...')
+                #print(f'Looping over a {len(x)} item list...')
                 # Loop over list, yield maching list (sub)items.
-                for list_item in self.x:
-                    list_item_wtf = wtf(list_item, stop=False)
+                for list_item in x:
+                    if type(list_item) in _LEAF_TYPES:
+                        continue
+                    list_item_wtf = WTF._of(list_item, name=name)
                     for list_item_result in list_item_wtf._find(child_name, max_depth=max_depth-1):
-                        yield ListItem(name=self._name, child=list_item_result, value=list_item)
+                        yield ListItem(name=name, child=list_item_result, value=list_item)
 
         # Recurse into fields.
-        for field_name in self.fields:
-            if not _is_boring(self.x, field_name):
-                #print(f'Recursing into {self._name}.{field_name}')
-                value = getattr(self.x, field_name)
-                field_wtf = wtf(value, stop=False)
-                field_wtf._name = field_name
+        for field_name in self._fields_and_functions[0]:
+            if not _is_boring(x, field_name):
+                #print(f'Recursing into {name}.{field_name}')
+                value = getattr(x, field_name)
+                if type(value) in _LEAF_TYPES:
+                    continue
+                field_wtf = WTF._of(value, name=field_name)
                 for field_result in field_wtf._find(child_name, max_depth=max_depth-1):
-                    yield Field(self._name, child_name=field_name, child=field_result, value=value)
+                    yield Field(name, child_name=field_name, child=field_result, value=value)
 
 
     def browse(self):
@@ -482,6 +682,7 @@ class HyperSensitive:
     def __reversed__(self):
         print(f'They\'re trying to reverse me!')
         if not hasattr(sys, 'ps1'):
+            import pdb
             pdb.Pdb(skip=BORING_MODULES).set_trace()
 
 
@@ -558,6 +759,20 @@ class ListItem(Object):
     {self.child.code(use_parent_name=True)}'''
 
 
+_STR_DISPATCH = {
+    float: WTF._str_number,
+    int: WTF._str_number,
+    str: WTF._str_literal,
+    list: WTF._str_collection,
+    tuple: WTF._str_collection,
+    set: WTF._str_collection,
+    Object: WTF._str_collection,
+    OrderedDict: WTF._str_ordered_dict,
+    dict: WTF._str_dict,
+    json.decoder.JSONDecodeError: WTF._str_json_decode_error,
+}
+
+
 # Replace the module with a WTF instance to save typing.
 wtf = WTF()
 wtf.__spec__ = __spec__
@@ -567,8 +782,10 @@ sys.modules[__name__] = wtf
 def wtf_excepthook(type, value, trace_back):
     if type == bdb.BdbQuit:
         return
+    import traceback
+    import pdb
     traceback.print_tb(trace_back)
-    print(wtf[value])
+    print(WTF._of(value))
     p = pdb.Pdb(skip=BORING_MODULES)
     p.reset()
     p.interaction(None, trace_back)